@@ -1,4 +1,5 @@
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 
 
 # Controls for toggling tests and defaults (ordered for readability)
@@ -18,6 +19,9 @@ CONTROLS: Dict[str, Any] = {
     "raw_tab_default": "Medellin_Raw",
     # List of cities used when cities_run_all=True
     "cities_list": ["Chattanooga", "Medellin", "Santa Cruz"],
+    # Max cities whose Area Insights phase runs at once in all-cities mode (1 = sequential).
+    # Each log line of that phase is prefixed with its city, e.g. "[Medellin][AreaInsights]..."
+    "cities_compute_concurrency": 3,
 
     # === Logging toggles ===
     "enable_verbose_logging": False,
@@ -62,12 +66,25 @@ CONTROLS: Dict[str, Any] = {
     ],
     # Pacing and caps
     "area_insights_overall_max": 300,
-    "area_details_pause_secs": 0.1,
+    # With area_write_only_closed, stop fetching details once this many closed rows are ready
+    # (0 = no separate cap; area_insights_overall_max still bounds the fetches)
+    "area_overall_max_closed": 0,
+    # Max Place Details requests per second across all workers and cities (0 = unthrottled)
+    "area_details_qps": 10,
+    # Max concurrent Place Details requests (1 = sequential)
+    "area_details_concurrency": 8,
     # Partitioning / reductions
     "area_max_places_per_request": 100,
-    # When enabled, iterate each single type and accumulate all batches
-    # whose count is <= area_max_places_per_request
+    # Single-batch mode: try INSIGHT_PLACES for the full type list first and only
+    # fall back to count-based reduction if the API rejects it as over the cap
+    # (used only when area_max_places_per_request is at the API's 100-place limit)
+    "area_speculative_places_first": True,
+    # When enabled, count each single type and accumulate all batches
+    # whose count is <= area_max_places_per_request (types are packed together
+    # into as few Places calls as the cap allows)
     "area_enable_gather_all_types": True,
+    # Max concurrent per-type INSIGHT_COUNT requests in gather-all mode (1 = sequential)
+    "area_count_concurrency": 8,
     "area_skip_large_single_type": True,
     # Fallback: when a single type still exceeds the cap, try the next types
     # If enabled, the runner will iterate over each type individually and fetch
@@ -91,6 +108,10 @@ CONTROLS: Dict[str, Any] = {
     "snapshot_enable": True,  # when True, write CSV snapshot before each city write
     "snapshot_include_headers": True,  # include headers row in snapshot CSV
     "snapshot_base_dir": ".",  # base directory for the 'data' folder
+    # Place Details disk cache (skip re-fetching places seen within the TTL; '--no-cache' disables)
+    "places_details_cache_enable": True,
+    "places_details_cache_ttl_hours": 168,  # one ISO week, matching the snapshot cadence
+    "places_details_cache_path": "data/.places_details_cache.sqlite3",
 
     # === Places (legacy labeling aids) ===
     # Simple controls retained for keyword/type labeling in rows
@@ -122,3 +143,73 @@ CITY_PRESETS: Dict[str, Dict[str, Any]] = {
 }
 
 
+@dataclass(frozen=True, slots=True)
+class Controls:
+    """Read-only, attribute-access view of CONTROLS for hot call sites.
+
+    Built from CONTROLS at import and rebuilt by refresh_controls_ns() once the
+    runner has applied its overrides (e.g. --no-cache); read it as
+    config.CONTROLS_NS so the rebuilt snapshot is seen. Keys mutated during a run
+    (city_name, raw_tab_default, places_center_*) are deliberately left out and
+    must be read from CONTROLS.
+    Defaults mirror the fallbacks used by CONTROLS.get(...) call sites.
+    """
+    area_insights_enable: bool = False
+    cities_run_all: bool = False
+    notify_email_test_enable: bool = False
+    notify_email_after_write_enable: bool = False
+    cities_list: List[str] = field(default_factory=list)
+    cities_compute_concurrency: int = 1
+    enable_verbose_logging: bool = False
+    area_log_request_build: bool = False
+    area_log_request_send: bool = False
+    area_log_response_keys: bool = False
+    area_log_full_response: bool = False
+    area_log_summary: bool = False
+    area_log_details_sample_count: int = 0
+    area_insights_mode: str = "count"
+    area_insights_location_mode: str = "circle"
+    area_insights_circle_radius_m: int = 10000
+    area_insights_types: List[str] = field(default_factory=list)
+    area_insights_operating_status: List[str] = field(default_factory=list)
+    area_insights_overall_max: int = 500
+    area_overall_max_closed: int = 0
+    area_details_qps: float = 10.0
+    area_details_concurrency: int = 8
+    area_max_places_per_request: int = 100
+    area_speculative_places_first: bool = False
+    area_enable_gather_all_types: bool = False
+    area_count_concurrency: int = 8
+    area_skip_large_single_type: bool = True
+    area_enable_single_type_fallback: bool = False
+    area_shuffle_types_enable: bool = False
+    area_shuffle_types_seed_mode: str = "daily"
+    area_shuffle_types_fixed_seed: int = 0
+    area_insights_write_enabled: bool = True
+    area_write_only_closed: bool = True
+    snapshot_enable: bool = True
+    snapshot_include_headers: bool = True
+    snapshot_base_dir: str = "."
+    places_details_cache_enable: bool = False
+    places_details_cache_ttl_hours: float = 168
+    places_details_cache_path: str = "data/.places_details_cache.sqlite3"
+    places_radius_m: int = 50000
+    places_keyword: str | None = None
+    places_type: str | None = None
+    notify_email_after_write_to_emails: List[str] = field(default_factory=list)
+    notify_email_test_to_emails: List[str] = field(default_factory=list)
+    notify_email_test_counts: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, controls: Dict[str, Any]) -> "Controls":
+        return cls(**{k: v for k, v in controls.items() if k in cls.__dataclass_fields__})
+
+
+CONTROLS_NS: Controls = Controls.from_dict(CONTROLS)
+
+
+def refresh_controls_ns() -> Controls:
+    """Rebuild CONTROLS_NS from the current CONTROLS (call after applying overrides)."""
+    global CONTROLS_NS
+    CONTROLS_NS = Controls.from_dict(CONTROLS)
+    return CONTROLS_NS
@@ -1,18 +1,209 @@
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, Iterator, List, Mapping, Tuple
 import random
-import hashlib
-from datetime import datetime, timezone
+import collections
+import contextlib
+import functools
+import itertools
+import json
 
 import os
 import sys
-import requests
-import gspread
-from dotenv import dotenv_values
-from google.oauth2.service_account import Credentials
-from google.auth.transport.requests import Request
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from scripts import config
 from scripts.config import CITY_PRESETS, CONTROLS
 
+# Third-party clients are imported lazily inside the functions that use them so
+# importing a single helper doesn't pay for requests/gspread/google-auth.
+if TYPE_CHECKING:
+    import gspread
+    import sqlite3
+
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+    from requests.adapters import HTTPAdapter
+
+
+# Service account fields: (.env key, service-account info key, default, required)
+_SA_FIELDS: Tuple[Tuple[str, str, str | None, bool], ...] = (
+    ("TYPE", "type", "service_account", False),
+    ("PROJECT_ID", "project_id", None, True),
+    ("PRIVATE_KEY_ID", "private_key_id", None, True),
+    ("PRIVATE_KEY", "private_key", None, True),
+    ("CLIENT_EMAIL", "client_email", None, True),
+    ("CLIENT_ID", "client_id", None, True),
+    ("AUTH_URI", "auth_uri", None, True),
+    ("TOKEN_URI", "token_uri", None, True),
+    ("AUTH_PROVIDER_X509_CERT_URL", "auth_provider_x509_cert_url", None, True),
+    ("CLIENT_X509_CERT_URL", "client_x509_cert_url", None, True),
+    ("UNIVERSE_DOMAIN", "universe_domain", "googleapis.com", False),
+)
+
+# OAuth scopes (google-auth accepts any sequence)
+_SPREADSHEET_SCOPES: Tuple[str, ...] = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.readonly",
+)
+_CLOUD_PLATFORM_SCOPES: Tuple[str, ...] = ("https://www.googleapis.com/auth/cloud-platform",)
+
+# Sheet row in required_headers() order; a tuple is cheaper to build than a list
+Row = collections.namedtuple(
+    "Row",
+    "id name status address lat lng types rating user_ratings keyword grid_lat grid_lng",
+)
+_EMPTY_DICT: Mapping[str, Any] = MappingProxyType({})
+
+# Place Details field mask (static; built once instead of per request). Only these fields are
+# billed and returned, so responses stay small enough that parsing is negligible.
+_PLACE_DETAILS_FIELDS = "name,id,displayName,formattedAddress,location,types,rating,userRatingCount,businessStatus"
+
+# INSIGHT_PLACES returns at most this many places; larger matches are rejected with a 400
+_INSIGHT_PLACES_API_CAP = 100
+
+# Memoized INSIGHT_COUNT results and successful INSIGHT_PLACES responses, keyed by
+# (sorted types, sorted statuses, location key); see _insights_key
+_COUNT_CACHE: Dict[Tuple[Tuple[str, ...], Tuple[str, ...], str], int] = {}
+_PLACES_CACHE: Dict[Tuple[Tuple[str, ...], Tuple[str, ...], str], Dict[str, Any]] = {}
+
+# On-disk Place Details cache (SQLite: one row per place resource); opened on first use
+_DETAILS_DB: "sqlite3.Connection | None" = None
+_DETAILS_CACHE_LOCK = threading.Lock()
+
+# Process-wide Place Details rate limiter (shared by every worker and city); built on first use
+_DETAILS_LIMITER: "_TokenBucket | None" = None
+_DETAILS_LIMITER_LOCK = threading.Lock()
+
+# Guards the caller-provided resource -> Future map in fetch_place_details_concurrent
+_SHARED_DETAILS_LOCK = threading.Lock()
+
+# Shared HTTP session (connection reuse/keep-alive across Places and Area Insights calls)
+_SESSION: "requests.Session | None" = None
+# Area Insights sessions keyed by client_email; AuthorizedSession refreshes the token only when expired
+_AI_SESSIONS: Dict[str, "AuthorizedSession"] = {}
+_AI_SESSIONS_LOCK = threading.Lock()
+# Authorized gspread clients keyed by client_email (gspread refreshes its own token)
+_GSPREAD_CLIENTS: Dict[str, "gspread.Client"] = {}
+# Opened spreadsheets keyed by (client_email, spreadsheet_id); one metadata GET per run
+_SPREADSHEETS: Dict[Tuple[str, str], "gspread.Spreadsheet"] = {}
+# Guards both gspread caches (the Sheets prefetch runs on a background thread)
+_GSPREAD_LOCK = threading.RLock()
+
+# Per-thread log tag (the city being computed in all-cities mode); see tagged_output
+_LOG_TAG = threading.local()
+
+
+def set_log_tag(tag: str | None) -> None:
+    """Tag this thread's output lines (used while tagged_output is active)."""
+    _LOG_TAG.value = tag
+
+
+def _log_tag() -> str | None:
+    return getattr(_LOG_TAG, "value", None)
+
+
+def tagged_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool whose workers inherit the calling thread's log tag."""
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=set_log_tag, initargs=(_log_tag(),))
+
+
+class _TaggedLineWriter:
+    """Stand-in for sys.stdout/stderr that emits whole lines, prefixed with the thread's log tag.
+
+    print() writes the text and the newline separately, so concurrent threads can
+    merge lines; buffering per thread until the newline keeps each line intact.
+    """
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._partial = threading.local()
+
+    def write(self, text: str) -> int:
+        *lines, rest = (getattr(self._partial, "text", "") + text).split("\n")
+        self._partial.text = rest
+        if lines:
+            tag = _log_tag()
+            prefix = f"[{tag}]" if tag else ""
+            with self._lock:
+                self._stream.write("".join(f"{prefix}{line}\n" for line in lines))
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+@contextlib.contextmanager
+def tagged_output() -> Iterator[None]:
+    """Within the block, prefix each stdout/stderr line with the writing thread's log tag."""
+    original = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = _TaggedLineWriter(original[0]), _TaggedLineWriter(original[1])
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = original
+
+
+@functools.lru_cache(maxsize=1)
+def _orjson():
+    """Return the orjson module when installed, else None (stdlib json fallback)."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def json_loads(content: bytes) -> Any:
+    oj = _orjson()
+    return oj.loads(content) if oj else json.loads(content)
+
+
+def json_dumps(obj: Any) -> bytes:
+    oj = _orjson()
+    return oj.dumps(obj) if oj else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _build_adapter() -> "HTTPAdapter":
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    # Both Google endpoints are read-only queries, so POST (computeInsights) is safe to retry
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    # Keep at least one warm connection per details worker so keep-alive sockets are never discarded
+    pool_maxsize = max(64, int(config.CONTROLS_NS.area_details_concurrency or 1))
+    return HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+
+
+def _request_gzip(session: "requests.Session") -> None:
+    # Google APIs only gzip responses when the User-Agent also contains "gzip"
+    session.headers["Accept-Encoding"] = "gzip"
+    session.headers["User-Agent"] = f"{session.headers.get('User-Agent', 'python-requests')} (gzip)"
+
+
+def _get_session() -> "requests.Session":
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        session = requests.Session()
+        session.mount("https://", _build_adapter())
+        _request_gzip(session)
+        _SESSION = session
+    return _SESSION
+
 
 def apply_city_preset(controls: Dict[str, Any]) -> None:
     city = controls.get("city_name")
@@ -27,66 +218,170 @@ def apply_city_preset(controls: Dict[str, Any]) -> None:
         print(f"[Controls] Applied city preset: {city} → lat={preset['lat']}, lng={preset['lng']}, tab={preset['tab']}")
 
 
-def load_env_or_exit() -> dict:
+@functools.lru_cache(maxsize=4)
+def _load_env_cached(path: str, mtime_ns: int) -> Mapping[str, str | None]:
+    """Parse a .env file once per (path, mtime); edits to the file invalidate the entry."""
+    from dotenv import dotenv_values
+    return MappingProxyType(dict(dotenv_values(path)))
+
+
+def load_env_or_exit() -> Mapping[str, str | None]:
     env_path = os.path.join(".env")
     if not os.path.isfile(env_path):
         print(f"Config file not found at: {env_path}. Create a .env at project root.", file=sys.stderr)
         sys.exit(1)
-    values = dotenv_values(env_path)
+    values = _load_env_cached(env_path, os.stat(env_path).st_mtime_ns)
     if not values:
         print("Failed to load values from .env.", file=sys.stderr)
         sys.exit(1)
     return values
 
 
-def build_service_account_info(values: dict) -> dict:
-    return {
-        "type": values.get("TYPE", "service_account"),
-        "project_id": values.get("PROJECT_ID"),
-        "private_key_id": values.get("PRIVATE_KEY_ID"),
-        "private_key": (values.get("PRIVATE_KEY") or "").replace("\\n", "\n"),
-        "client_email": values.get("CLIENT_EMAIL"),
-        "client_id": values.get("CLIENT_ID"),
-        "auth_uri": values.get("AUTH_URI"),
-        "token_uri": values.get("TOKEN_URI"),
-        "auth_provider_x509_cert_url": values.get("AUTH_PROVIDER_X509_CERT_URL"),
-        "client_x509_cert_url": values.get("CLIENT_X509_CERT_URL"),
-        "universe_domain": values.get("UNIVERSE_DOMAIN", "googleapis.com"),
-    }
+@functools.lru_cache(maxsize=1)
+def _service_account_info_cached(items: frozenset) -> Mapping[str, Any]:
+    values = dict(items)
+    info = {info_key: values.get(env_key, default) for env_key, info_key, default, _ in _SA_FIELDS}
+    # Un-escape the PEM once per distinct .env instead of on every credentials build
+    info["private_key"] = (info["private_key"] or "").replace("\\n", "\n")
+    return MappingProxyType(info)
+
+
+def build_service_account_info(values: Mapping[str, str | None]) -> dict:
+    return dict(_service_account_info_cached(frozenset(values.items())))
 
 
 def validate_service_account_info_or_exit(info: dict) -> None:
-    required_fields = [
-        "project_id",
-        "private_key_id",
-        "private_key",
-        "client_email",
-        "client_id",
-        "auth_uri",
-        "token_uri",
-        "auth_provider_x509_cert_url",
-        "client_x509_cert_url",
-    ]
-    missing = [k for k in required_fields if not info.get(k)]
+    missing = [info_key for _, info_key, _, required in _SA_FIELDS if required and not info.get(info_key)]
     if missing:
         print(f"Missing required fields in .env: {', '.join(missing)}", file=sys.stderr)
         sys.exit(1)
 
 
-def authorize_client(values: dict) -> gspread.Client:
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.readonly",
-    ]
-    service_account_info = build_service_account_info(values)
-    validate_service_account_info_or_exit(service_account_info)
+def authorize_client(values: dict) -> "gspread.Client":
+    key = values.get("CLIENT_EMAIL") or ""
+    cached = _GSPREAD_CLIENTS.get(key)
+    if cached is not None:
+        return cached
+    with _GSPREAD_LOCK:
+        cached = _GSPREAD_CLIENTS.get(key)
+        if cached is not None:
+            return cached
+        import gspread
+        from google.oauth2.service_account import Credentials
+        service_account_info = build_service_account_info(values)
+        validate_service_account_info_or_exit(service_account_info)
+        try:
+            credentials = Credentials.from_service_account_info(service_account_info, scopes=_SPREADSHEET_SCOPES)
+        except Exception as e:
+            print(f"Failed to create credentials from .env: {e}", file=sys.stderr)
+            sys.exit(1)
+        client = gspread.authorize(credentials)
+        _GSPREAD_CLIENTS[key] = client
+        return client
+
+
+def open_spreadsheet(values: dict, spreadsheet_id: str) -> "gspread.Spreadsheet":
+    """Return the spreadsheet handle for spreadsheet_id, opening it once per run."""
+    key = (values.get("CLIENT_EMAIL") or "", spreadsheet_id)
+    cached = _SPREADSHEETS.get(key)
+    if cached is not None:
+        return cached
+    with _GSPREAD_LOCK:
+        cached = _SPREADSHEETS.get(key)
+        if cached is None:
+            cached = authorize_client(values).open_by_key(spreadsheet_id)
+            _SPREADSHEETS[key] = cached
+        return cached
+
+
+def _details_db() -> "sqlite3.Connection":
+    """Open the Place Details cache database once per run (in-memory if the file can't be used)."""
+    global _DETAILS_DB
+    with _DETAILS_CACHE_LOCK:
+        if _DETAILS_DB is None:
+            import sqlite3
+            path = config.CONTROLS_NS.places_details_cache_path
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False)
+                db.execute("CREATE TABLE IF NOT EXISTS place_details (resource TEXT PRIMARY KEY, json BLOB, ts INTEGER)")
+            except Exception as e:
+                print(f"[DetailsCache][Warning] Ignoring unusable cache {path}: {e}")
+                db = sqlite3.connect(":memory:", check_same_thread=False)
+                db.execute("CREATE TABLE place_details (resource TEXT PRIMARY KEY, json BLOB, ts INTEGER)")
+            _DETAILS_DB = db
+        return _DETAILS_DB
+
+
+def _details_cache_get(place_resource_name: str) -> Dict[str, Any] | None:
+    """Return cached details for a resource if stored within the TTL, else None."""
+    db = _details_db()
+    with _DETAILS_CACHE_LOCK:
+        row = db.execute("SELECT json, ts FROM place_details WHERE resource = ?", (place_resource_name,)).fetchone()
+    if row is None or time.time() - row[1] >= float(config.CONTROLS_NS.places_details_cache_ttl_hours) * 3600:
+        return None
+    return json_loads(row[0])
+
+
+def _details_cache_put(place_resource_name: str, data: Dict[str, Any]) -> None:
+    db = _details_db()
+    blob = json_dumps(data)
+    with _DETAILS_CACHE_LOCK:
+        db.execute(
+            "INSERT OR REPLACE INTO place_details (resource, json, ts) VALUES (?, ?, ?)",
+            (place_resource_name, blob, int(time.time())),
+        )
+
+
+def save_place_details_cache() -> None:
+    """Commit new Place Details cache rows (pruning expired ones). No-op when disabled or unused."""
+    if _DETAILS_DB is None or not config.CONTROLS_NS.places_details_cache_enable:
+        return
+    cutoff = int(time.time() - float(config.CONTROLS_NS.places_details_cache_ttl_hours) * 3600)
     try:
-        credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+        with _DETAILS_CACHE_LOCK:
+            _DETAILS_DB.execute("DELETE FROM place_details WHERE ts < ?", (cutoff,))
+            _DETAILS_DB.commit()
     except Exception as e:
-        print(f"Failed to create credentials from .env: {e}", file=sys.stderr)
-        sys.exit(1)
-    client = gspread.authorize(credentials)
-    return client
+        print(f"[DetailsCache][Warning] Failed to write {config.CONTROLS_NS.places_details_cache_path}: {e}")
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second (bursting to `burst`).
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    workers never block each other from computing their own delay.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._rate = float(rate)
+        self._burst = float(max(1, burst))
+        self._tokens = self._burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _details_limiter() -> "_TokenBucket | None":
+    """Return the shared Place Details limiter, or None when area_details_qps <= 0 (unthrottled)."""
+    global _DETAILS_LIMITER
+    qps = float(config.CONTROLS_NS.area_details_qps or 0)
+    if qps <= 0:
+        return None
+    if _DETAILS_LIMITER is None:
+        with _DETAILS_LIMITER_LOCK:
+            if _DETAILS_LIMITER is None:
+                _DETAILS_LIMITER = _TokenBucket(qps, burst=int(config.CONTROLS_NS.area_details_concurrency or 1))
+    return _DETAILS_LIMITER
 
 
 def fetch_place_details(values: Dict[str, str], place_resource_name: str) -> Dict[str, Any]:
@@ -94,45 +389,122 @@ def fetch_place_details(values: Dict[str, str], place_resource_name: str) -> Dic
     if not api_key:
         print("Missing PLACES_API_KEY in .env", file=sys.stderr)
         sys.exit(1)
-    fields = ",".join([
-        "name",
-        "id",
-        "displayName",
-        "formattedAddress",
-        "location",
-        "types",
-        "rating",
-        "userRatingCount",
-        "businessStatus",
-    ])
+    use_cache = config.CONTROLS_NS.places_details_cache_enable
+    if use_cache:
+        cached = _details_cache_get(place_resource_name)
+        if cached is not None:
+            return cached
+    # Only network calls spend rate budget; cache hits return above without waiting
+    limiter = _details_limiter()
+    if limiter is not None:
+        limiter.acquire()
     url = f"https://places.googleapis.com/v1/{place_resource_name}"
     headers = {
         "X-Goog-Api-Key": api_key,
+        "X-Goog-FieldMask": _PLACE_DETAILS_FIELDS,
     }
-    params = {"fields": fields}
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
+    resp = _get_session().get(url, headers=headers, timeout=30)
     try:
-        data = resp.json()
+        data = json_loads(resp.content)
     except Exception:
         print(f"Place Details returned non-JSON (status {resp.status_code}) for {place_resource_name}", file=sys.stderr)
         return {}
     if resp.status_code != 200:
         return {}
+    if use_cache:
+        _details_cache_put(place_resource_name, data)
     return data
 
 
-def build_area_insights_credentials(values: dict):
+def fetch_place_details_concurrent(values: Mapping[str, str | None],
+                                   place_resources: List[str],
+                                   max_workers: int = 8,
+                                   shared: "Dict[str, Future[Dict[str, Any]]] | None" = None) -> Iterator[Dict[str, Any]]:
+    """Fetch Place Details for many resources on a bounded thread pool.
+
+    Lazily yields results in input order as they become available; each result
+    matches fetch_place_details ({} on failure). Requests are submitted a bounded
+    window ahead of the consumer, so closing the generator early stops new fetches.
+    At most max_workers requests are in flight; request rate is capped separately
+    by the shared area_details_qps token bucket.
+    shared, when given, maps place resource -> Future and is reused across calls
+    (e.g. concurrently computed cities): a resource already fetched or in flight
+    elsewhere is awaited instead of requested again.
+    """
+    if shared is None:
+        shared = {}
+
+    def _claim(pr: str, submit) -> "Future[Dict[str, Any]]":
+        with _SHARED_DETAILS_LOCK:
+            fut = shared.get(pr)
+            if fut is None:
+                fut = shared[pr] = submit(pr)
+        return fut
+
+    if max_workers <= 1 or len(place_resources) <= 1:
+        for pr in place_resources:
+            # Claim a pending Future under the lock, then fetch outside it so other
+            # callers' claims never wait on this request (or its rate-limit sleep)
+            with _SHARED_DETAILS_LOCK:
+                fut = shared.get(pr)
+                owned = fut is None
+                if owned:
+                    fut = shared[pr] = Future()
+            if owned:
+                try:
+                    fut.set_result(fetch_place_details(values, pr))
+                except BaseException as e:
+                    fut.set_exception(e)
+            yield fut.result()
+        return
+    with tagged_pool(max_workers) as ex:
+        submit = functools.partial(ex.submit, fetch_place_details, values)
+        # Keep a bounded window in flight so a consumer that stops early leaves at most the
+        # window unfetched-but-paid-for, instead of every remaining resource
+        pending = iter(place_resources)
+        window = collections.deque(_claim(pr, submit) for pr in itertools.islice(pending, max_workers * 2))
+        while window:
+            fut = window.popleft()
+            for pr in itertools.islice(pending, 1):
+                window.append(_claim(pr, submit))
+            yield fut.result()
+
+
+def build_area_insights_credentials(values: dict) -> "Credentials":
+    from google.oauth2.service_account import Credentials
     service_account_info = build_service_account_info(values)
     validate_service_account_info_or_exit(service_account_info)
     try:
-        scopes = ["https://www.googleapis.com/auth/cloud-platform"]
-        credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+        credentials = Credentials.from_service_account_info(service_account_info, scopes=_CLOUD_PLATFORM_SCOPES)
     except Exception as e:
         print(f"Failed to create Area Insights credentials: {e}", file=sys.stderr)
         sys.exit(1)
     return credentials
 
 
+def _get_area_session(values: Dict[str, str]) -> "AuthorizedSession":
+    """Return the pooled Area Insights session for this service account, creating it once."""
+    key = values.get("CLIENT_EMAIL") or ""
+    with _AI_SESSIONS_LOCK:
+        session = _AI_SESSIONS.get(key)
+        if session is None:
+            from google.auth.exceptions import GoogleAuthError
+            from google.auth.transport.requests import AuthorizedSession, Request
+            credentials = build_area_insights_credentials(values)
+            # Fetch the first token here, under the lock: google-auth doesn't serialize
+            # refreshes, so the first concurrent wave would otherwise exchange one per thread
+            try:
+                credentials.refresh(Request())
+            except GoogleAuthError as e:
+                print(f"Failed to refresh Area Insights token: {e}", file=sys.stderr)
+                sys.exit(1)
+            session = AuthorizedSession(credentials)
+            session.mount("https://", _build_adapter())
+            _request_gzip(session)
+            _AI_SESSIONS[key] = session
+        return session
+
+
 def area_insights_compute(values: Dict[str, str],
                           insights: List[str],
                           location_filter: Dict[str, Any],
@@ -140,89 +512,143 @@ def area_insights_compute(values: Dict[str, str],
                           operating_status: List[str] | None,
                           price_levels: List[str] | None = None,
                           rating_filter: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    verbose = config.CONTROLS_NS.enable_verbose_logging
+    log_build = config.CONTROLS_NS.area_log_request_build
+    log_send = config.CONTROLS_NS.area_log_request_send
+    log_keys = config.CONTROLS_NS.area_log_response_keys
+    log_full = config.CONTROLS_NS.area_log_full_response
+    do_build_log = bool(verbose or log_build)
+    do_send_log = bool(verbose or log_send)
+    do_keys_log = bool(verbose or log_keys)
+    do_full_log = bool(verbose and log_full)
     url = "https://areainsights.googleapis.com/v1:computeInsights"
-    creds = build_area_insights_credentials(values)
-    try:
-        creds.refresh(Request())
-    except Exception as e:
-        print(f"Failed to refresh Area Insights token: {e}", file=sys.stderr)
-        sys.exit(1)
-    headers = {
-        "Authorization": f"Bearer {creds.token}",
-        "Content-Type": "application/json",
-    }
+    session = _get_area_session(values)
+    headers = {"Content-Type": "application/json"}
+    filters = (
+        ("locationFilter", location_filter),
+        ("typeFilter", type_filter),
+        ("operatingStatus", operating_status),
+        ("priceLevels", price_levels),
+        ("ratingFilter", rating_filter),
+    )
     body: Dict[str, Any] = {
         "insights": insights,
-        "filter": {
-            "locationFilter": location_filter,
-        }
+        "filter": {k: v for k, v in filters if v},
     }
-    if type_filter:
-        body["filter"]["typeFilter"] = type_filter
-    if operating_status:
-        body["filter"]["operatingStatus"] = operating_status
-    if price_levels:
-        body["filter"]["priceLevels"] = price_levels
-    if rating_filter:
-        body["filter"]["ratingFilter"] = rating_filter
-    if CONTROLS.get("enable_verbose_logging") or CONTROLS.get("area_log_request_build"):
-        print("[AreaInsights][Build] Built request")
-        print(f"  url={url}")
-        print(f"  body={body}")
-    if CONTROLS.get("enable_verbose_logging") or CONTROLS.get("area_log_request_send"):
-        print("[AreaInsights][Request] POST")
-        print(f"  url={url}")
-        print(f"  body={body}")
-    resp = requests.post(url, headers=headers, json=body, timeout=60)
+    if do_build_log or do_send_log:
+        # Render the body once, and only when it will actually be printed
+        body_text = f"{body}"
+        if do_build_log:
+            print("[AreaInsights][Build] Built request")
+            print(f"  url={url}")
+            print(f"  body={body_text}")
+        if do_send_log:
+            print("[AreaInsights][Request] POST")
+            print(f"  url={url}")
+            print(f"  body={body_text}")
+    from google.auth.exceptions import GoogleAuthError
     try:
-        data = resp.json()
+        resp = session.post(url, headers=headers, data=json_dumps(body), timeout=60)
+    except GoogleAuthError as e:
+        print(f"Failed to refresh Area Insights token: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        data = json_loads(resp.content)
     except Exception:
         print(f"Area Insights returned non-JSON (status {resp.status_code})", file=sys.stderr)
         sys.exit(1)
     if resp.status_code != 200:
         return {"_error": {"status": resp.status_code, "body": data}}
-    if CONTROLS.get("enable_verbose_logging") or CONTROLS.get("area_log_response_keys"):
+    if do_keys_log:
         print(f"[AreaInsights][Response] keys={list(data.keys())}")
-    if CONTROLS.get("enable_verbose_logging") and CONTROLS.get("area_log_full_response"):
-        import json as _json
-        print(f"[AreaInsights][Response] full={_json.dumps(data, ensure_ascii=False)[:4000]}")
+    if do_full_log:
+        print(f"[AreaInsights][Response] full={json_dumps(data).decode('utf-8')[:4000]}")
     return data
 
 
 
-def _parse_count_value(count_data: Dict[str, Any]) -> int:
+def parse_count_value(count_data: Dict[str, Any]) -> int:
     """Safely parse the 'count' field from an Area Insights response into an int."""
-    count_str = count_data.get("count") or "0"
+    v = count_data.get("count")
+    if v is None or v == "0":
+        return 0
     try:
-        return int(count_str)
-    except Exception:
+        return int(v)
+    except (ValueError, TypeError):
         return 0
 
 
+@functools.lru_cache(maxsize=64)
+def _type_filter_for(types: Tuple[str, ...]) -> Dict[str, Any]:
+    """Shared typeFilter body per type tuple. Treat the returned dict as read-only."""
+    return {"includedTypes": list(types)}
+
+
+def _location_key(location_filter: Dict[str, Any]) -> str:
+    """Canonical, hashable form of a locationFilter for cache keys."""
+    return json.dumps(location_filter, sort_keys=True)
+
+
+def _insights_key(types: List[str],
+                  operating_status: List[str] | None,
+                  location_filter: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[str, ...], str]:
+    """Order-insensitive memo key: the API treats both filters as sets."""
+    return (tuple(sorted(types or ())), tuple(sorted(operating_status or ())), _location_key(location_filter))
+
+
+def clear_area_insights_cache() -> None:
+    """Drop memoized Area Insights counts and places (e.g., between cities in a multi-city run)."""
+    _COUNT_CACHE.clear()
+    _PLACES_CACHE.clear()
+
+
 def _area_count_for_types(values: Dict[str, str],
                           location_filter: Dict[str, Any],
                           types: List[str],
-                          operating_status: List[str] | None) -> Dict[str, Any]:
-    return area_insights_compute(
+                          operating_status: List[str] | None) -> int | None:
+    """Return the INSIGHT_COUNT for types, memoized per run. None on API error (logged)."""
+    key = _insights_key(types, operating_status, location_filter)
+    cached = _COUNT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    count_data = area_insights_compute(
         values,
         insights=["INSIGHT_COUNT"],
         location_filter=location_filter,
-        type_filter={"includedTypes": types} if types else None,
+        type_filter=_type_filter_for(tuple(types)) if types else None,
         operating_status=operating_status,
     )
+    if "_error" in count_data:
+        err = count_data["_error"]
+        print(f"[AreaInsights][Count][Error] status={err['status']} body={err['body']}")
+        return None
+    count_val = parse_count_value(count_data)
+    _COUNT_CACHE[key] = count_val
+    return count_val
 
 
 def _area_places_for_types(values: Dict[str, str],
                            location_filter: Dict[str, Any],
                            types: List[str],
                            operating_status: List[str] | None) -> Dict[str, Any]:
-    return area_insights_compute(
+    """Return the INSIGHT_PLACES response for types, memoized per run unless it is an error.
+
+    The cached response is shared between callers; treat it as read-only.
+    """
+    key = _insights_key(types, operating_status, location_filter)
+    cached = _PLACES_CACHE.get(key)
+    if cached is not None:
+        return cached
+    data = area_insights_compute(
         values,
         insights=["INSIGHT_PLACES"],
         location_filter=location_filter,
-        type_filter={"includedTypes": types} if types else None,
+        type_filter=_type_filter_for(tuple(types)) if types else None,
         operating_status=operating_status,
     )
+    if "_error" not in data:
+        _PLACES_CACHE[key] = data
+    return data
 
 
 def find_place_insights_under_cap(values: Dict[str, str],
@@ -233,26 +659,52 @@ def find_place_insights_under_cap(values: Dict[str, str],
     """Return placeInsights for a given type list, ensuring count <= max_per.
 
     Strategy:
+    - Optionally (area_speculative_places_first, max_per at the API limit) request
+      places for the full list directly; if the API accepts, return them (one call).
     - Compute count for the full list. If <= max_per, fetch places and return.
     - If count exceeds cap, iteratively reduce the working list by half and retry.
     - When reduced to a single type that still exceeds the cap, optionally skip
       or attempt single-type fallbacks across the original order (controlled by CONTROLS).
     - Returns an empty list on errors or when no subset fits under the cap.
     """
-    working_types: List[str] = list(included_types or [])
-    original_types: List[str] = list(working_types)
+    log_summary = config.CONTROLS_NS.area_log_summary
+    skip_large = config.CONTROLS_NS.area_skip_large_single_type
+    fallback_enabled = config.CONTROLS_NS.area_enable_single_type_fallback
+    types_list: List[str] = list(included_types or [])
     place_insights: List[Dict[str, Any]] = []
-    fetched = False
 
-    while working_types and not fetched:
+    # INSIGHT_PLACES itself rejects sets over the API's cap, so when max_per is that cap a
+    # successful speculative fetch makes the count call redundant
+    if types_list and config.CONTROLS_NS.area_speculative_places_first and max_per >= _INSIGHT_PLACES_API_CAP:
+        data = _area_places_for_types(values, location_filter, types_list, operating_status)
+        if "_error" not in data:
+            place_insights = data.get("placeInsights") or []
+            if log_summary:
+                print(f"[AreaInsights][Places] returned={len(place_insights)} for types={types_list}")
+            return place_insights
+        err = data["_error"]
+        if err["status"] != 400:
+            print(f"[AreaInsights][Places][Error] status={err['status']} body={err['body']}")
+            return place_insights
+        if log_summary:
+            print("[AreaInsights][Places] Full type list rejected (likely over cap); falling back to counts")
+
+    # Prefix lengths visited by the "drop half, retry" search, computed up front
+    schedule: List[int] = []
+    n = len(types_list)
+    if n:
+        schedule.append(n)
+    while n > 1:
+        n -= max(1, n // 2)
+        schedule.append(n)
+
+    for step, end in enumerate(schedule):
+        working_types = types_list[:end]
         # 1) Count for current set of types
-        count_data = _area_count_for_types(values, location_filter, working_types, operating_status)
-        if "_error" in count_data:
-            err = count_data["_error"]
-            print(f"[AreaInsights][Count][Error] status={err['status']} body={err['body']}")
+        count_val = _area_count_for_types(values, location_filter, working_types, operating_status)
+        if count_val is None:
             break
-        count_val = _parse_count_value(count_data)
-        if CONTROLS.get("area_log_summary"):
+        if log_summary:
             print(f"[AreaInsights][Count] types={working_types} count={count_val}")
 
         if count_val == 0:
@@ -267,30 +719,27 @@ def find_place_insights_under_cap(values: Dict[str, str],
                 print(f"[AreaInsights][Places][Error] status={err['status']} body={err['body']}")
                 break
             place_insights = data.get("placeInsights") or []
-            if CONTROLS.get("area_log_summary"):
+            if log_summary:
                 print(f"[AreaInsights][Places] returned={len(place_insights)} for types={working_types}")
-            fetched = True
             break
 
         # count_val > max_per → reduce or fallback
         if len(working_types) == 1:
-            if CONTROLS.get("area_skip_large_single_type", True):
-                if CONTROLS.get("area_log_summary"):
+            if skip_large:
+                if log_summary:
                     print(f"[AreaInsights][Count] single type {working_types[0]} exceeds {max_per}; skipping fetch")
                 # Try fallback if enabled: iterate over remaining single types in original order
-                if CONTROLS.get("area_enable_single_type_fallback"):
-                    if CONTROLS.get("area_log_summary"):
+                if fallback_enabled:
+                    if log_summary:
                         print("[AreaInsights][Count] Trying next available single-type fallbacks")
-                    for t in original_types:
+                    # included_types is never mutated (reductions re-slice working_types), so iterate it directly
+                    for t in included_types:
                         if t == working_types[0]:
                             continue
-                        fb_count = _area_count_for_types(values, location_filter, [t], operating_status)
-                        if "_error" in fb_count:
-                            err = fb_count["_error"]
-                            print(f"[AreaInsights][Count][Error] status={err['status']} body={err['body']}")
+                        fb_val = _area_count_for_types(values, location_filter, [t], operating_status)
+                        if fb_val is None:
                             continue
-                        fb_val = _parse_count_value(fb_count)
-                        if CONTROLS.get("area_log_summary"):
+                        if log_summary:
                             print(f"[AreaInsights][Count] types={[t]} count={fb_val}")
                         if fb_val == 0:
                             continue
@@ -301,126 +750,200 @@ def find_place_insights_under_cap(values: Dict[str, str],
                                 print(f"[AreaInsights][Places][Error] status={err['status']} body={err['body']}")
                                 continue
                             place_insights = data.get("placeInsights") or []
-                            if CONTROLS.get("area_log_summary"):
+                            if log_summary:
                                 print(f"[AreaInsights][Places] returned={len(place_insights)} for types={[t]}")
-                            fetched = True
                             break
                         else:
-                            if CONTROLS.get("area_log_summary"):
+                            if log_summary:
                                 print(f"[AreaInsights][Count] single type {t} exceeds {max_per}; skipping fetch")
                 break
-            # If not skipping large single type, we would have fetched above; fall through
+            # Not skipping: a single type is the last prefix, so the search ends here
 
-        # Drop half of the types (last half) and retry
-        drop_n = max(1, len(working_types) // 2)
-        working_types = working_types[:-drop_n]
-        if CONTROLS.get("area_log_summary"):
-            print(f"[AreaInsights][Count] Reducing types; retry with {working_types}")
+        # Drop half of the types (last half) and retry with the next prefix
+        if log_summary and step + 1 < len(schedule):
+            print(f"[AreaInsights][Count] Reducing types; retry with {types_list[:schedule[step + 1]]}")
 
     return place_insights
 
 
+def _pack_types_under_cap(types: List[str], counts: Dict[str, int], max_per: int) -> List[List[str]]:
+    """Group types into buckets whose summed counts stay <= max_per (first-fit decreasing).
+
+    A bucket's real count can only be lower than its sum (types overlap), so one
+    INSIGHT_PLACES call per bucket returns every place of its types. Buckets come
+    back ordered by their earliest type in `types`, preserving the caller's order.
+    """
+    rank = {t: i for i, t in enumerate(types)}
+    buckets: List[List[str]] = []
+    totals: List[int] = []
+    for t in sorted(types, key=counts.__getitem__, reverse=True):
+        c = counts[t]
+        for i, total in enumerate(totals):
+            if total + c <= max_per:
+                buckets[i].append(t)
+                totals[i] = total + c
+                break
+        else:
+            buckets.append([t])
+            totals.append(c)
+    for bucket in buckets:
+        bucket.sort(key=rank.__getitem__)
+    buckets.sort(key=lambda bucket: rank[bucket[0]])
+    return buckets
+
+
 def gather_all_under_cap_across_types(values: Dict[str, str],
                                       location_filter: Dict[str, Any],
                                       included_types: List[str],
                                       operating_status: List[str] | None,
                                       max_per: int) -> List[Dict[str, Any]]:
-    """Accumulate placeInsights by scanning each single type and adding all batches
-    whose count <= max_per. Deduplicates by place resource. Stops once the
-    aggregated list reaches the overall max configured in CONTROLS.
+    """Accumulate placeInsights across all types whose count <= max_per.
+
+    Counts every single type up front (concurrently), packs the eligible types into
+    buckets whose summed counts fit under max_per, and fetches places once per
+    bucket. Deduplicates by place resource. Stops once the aggregated list reaches
+    the overall max configured in CONTROLS.
 
     Notes:
     - Skips types with count == 0
     - Skips types with count > max_per (honors area_skip_large_single_type semantics)
     - Prints concise logs when area_log_summary is enabled
     """
+    log_summary = config.CONTROLS_NS.area_log_summary
     aggregated: List[Dict[str, Any]] = []
     seen_places: set[str] = set()
-    overall_limit = int(CONTROLS.get("area_insights_overall_max", 500))
+    seen_add = seen_places.add
+    agg_append = aggregated.append
+    overall_limit = int(config.CONTROLS_NS.area_insights_overall_max)
+    workers = max(1, min(int(config.CONTROLS_NS.area_count_concurrency or 1), len(included_types)))
 
-    if CONTROLS.get("area_log_summary"):
+    if log_summary:
         print(f"[AreaInsights][GatherAll] Start types={included_types} max_per={max_per} overall_limit={overall_limit}")
 
-    for t in included_types:
-        # Count per single type
-        count_data = _area_count_for_types(values, location_filter, [t], operating_status)
-        if "_error" in count_data:
-            err = count_data["_error"]
-            print(f"[AreaInsights][Count][Error] status={err['status']} body={err['body']}")
+    def _count(t: str) -> int | None:
+        return _area_count_for_types(values, location_filter, [t], operating_status)
+
+    # 1) Count per single type, all in one concurrent fan-out
+    if workers <= 1:
+        type_counts = list(map(_count, included_types))
+    else:
+        with tagged_pool(workers) as ex:
+            type_counts = list(ex.map(_count, included_types))
+
+    counts: Dict[str, int] = {}
+    for t, count_val in zip(included_types, type_counts):
+        if count_val is None:
             continue
-        count_val = _parse_count_value(count_data)
-        if CONTROLS.get("area_log_summary"):
+        if log_summary:
             print(f"[AreaInsights][Count] types={[t]} count={count_val}")
-
         if count_val == 0:
             continue
-
         if count_val <= max_per:
-            data = _area_places_for_types(values, location_filter, [t], operating_status)
-            if "_error" in data:
-                err = data["_error"]
-                print(f"[AreaInsights][Places][Error] status={err['status']} body={err['body']}")
-                continue
-            places = data.get("placeInsights") or []
-            added_here = 0
-            for pi in places:
-                place_resource = pi.get("place")
-                if not place_resource:
-                    continue
-                if place_resource in seen_places:
-                    continue
-                seen_places.add(place_resource)
-                aggregated.append(pi)
+            counts[t] = count_val
+        elif log_summary:
+            print(f"[AreaInsights][Count] single type {t} exceeds {max_per}; skipping fetch")
+
+    # 2) One Places call per packed bucket
+    buckets = _pack_types_under_cap(list(counts), counts, max_per)
+    if log_summary and buckets:
+        print(f"[AreaInsights][GatherAll] Packed {len(counts)} types into {len(buckets)} requests")
+
+    for bucket in buckets:
+        data = _area_places_for_types(values, location_filter, bucket, operating_status)
+        if "_error" in data:
+            err = data["_error"]
+            print(f"[AreaInsights][Places][Error] status={err['status']} body={err['body']}")
+            continue
+        places = data.get("placeInsights") or []
+        # One dict lookup and one membership test per place; stop once the overall limit is hit
+        room = overall_limit - len(aggregated)
+        added_here = 0
+        for pi in places:
+            if (place_resource := pi.get("place")) and place_resource not in seen_places:
+                seen_add(place_resource)
+                agg_append(pi)
                 added_here += 1
-                if len(aggregated) >= overall_limit:
+                if added_here >= room:
                     break
-            if CONTROLS.get("area_log_summary"):
-                print(f"[AreaInsights][Places] returned={len(places)} for types={[t]} added={added_here} total={len(aggregated)}")
-            if len(aggregated) >= overall_limit:
-                if CONTROLS.get("area_log_summary"):
-                    print(f"[AreaInsights][GatherAll] Reached overall limit {overall_limit}; stopping")
-                break
-        else:
-            if CONTROLS.get("area_log_summary"):
-                print(f"[AreaInsights][Count] single type {t} exceeds {max_per}; skipping fetch")
+        if log_summary:
+            print(f"[AreaInsights][Places] returned={len(places)} for types={bucket} added={added_here} total={len(aggregated)}")
+        if len(aggregated) >= overall_limit:
+            if log_summary:
+                print(f"[AreaInsights][GatherAll] Reached overall limit {overall_limit}; stopping")
+            break
 
-    if CONTROLS.get("area_log_summary"):
+    if log_summary:
         print(f"[AreaInsights][GatherAll] Finished total={len(aggregated)} unique places")
     return aggregated
 
 
-def map_place_to_row(place: Dict[str, Any], keyword: str | None, grid_lat: float | None, grid_lng: float | None) -> List[Any]:
-    loc = (place.get("location") or {})
-    lat = loc.get("latitude")
-    lng = loc.get("longitude")
-    display_name = place.get("displayName") or {}
-    name_text = display_name.get("text") if isinstance(display_name, dict) else display_name
-    types = place.get("types") or []
-    return [
-        (place.get("id") or place.get("name")),
+def map_place_to_row(place: Dict[str, Any], keyword: str | None, grid_lat: float | None, grid_lng: float | None) -> Row:
+    g = place.get
+    loc_g = (g("location") or _EMPTY_DICT).get
+    display_name = g("displayName") or _EMPTY_DICT
+    name_text = display_name if isinstance(display_name, str) else display_name.get("text")
+    return Row(
+        g("id") or g("name"),
         name_text,
-        place.get("businessStatus"),
-        place.get("formattedAddress"),
-        lat,
-        lng,
-        ",".join(types),
-        place.get("rating"),
-        place.get("userRatingCount"),
+        g("businessStatus"),
+        g("formattedAddress"),
+        loc_g("latitude"),
+        loc_g("longitude"),
+        ",".join(g("types") or ()),
+        g("rating"),
+        g("userRatingCount"),
         keyword or "",
         grid_lat,
         grid_lng,
-    ]
+    )
+
+
+def map_details_to_rows(details: Iterable[Dict[str, Any]],
+                        allowed_types: Collection[str],
+                        write_only_closed: bool,
+                        max_rows: int | None = None) -> Tuple[List[Row], int]:
+    """Map Place Details to sheet rows; returns (rows, number of details consumed).
+
+    Pure: no I/O and no CONTROLS access. details may be a lazy stream; each
+    detail is mapped as it arrives. When write_only_closed is set, only
+    CLOSED_TEMPORARILY places become rows. Consumption stops as soon as
+    max_rows rows are collected (when given), leaving the rest of the stream unread.
+    """
+    rows: List[Row] = []
+    append = rows.append
+    seen_n = 0
+    for p in details:
+        seen_n += 1
+        if write_only_closed and p.get("businessStatus") != "CLOSED_TEMPORARILY":
+            continue
+        append(map_place_to_row(p, select_matching_keywords(p.get("types") or [], allowed_types), None, None))
+        if max_rows is not None and len(rows) >= max_rows:
+            break
+    return rows, seen_n
 
 
-def select_matching_keywords(place_types: List[str], allowed_types: List[str]) -> str:
+def select_matching_keywords(place_types: List[str], allowed_types: Collection[str]) -> str:
+    """Return the place's types that are also allowed, comma-joined in the place's order.
+
+    Pass a set/frozenset as allowed_types when calling per place so it isn't rebuilt each time.
+    """
     if not place_types or not allowed_types:
         return ""
-    allowed_set = set(allowed_types)
-    ordered_matches: List[str] = []
-    for t in place_types:
-        if t in allowed_set:
-            ordered_matches.append(t)
-    return ",".join(ordered_matches)
+    allowed_set = allowed_types if isinstance(allowed_types, (set, frozenset)) else frozenset(allowed_types)
+    return ",".join(t for t in place_types if t in allowed_set)
+
+
+@functools.lru_cache(maxsize=16)
+def _daily_seed(city: str, day_index: int) -> int:
+    """Seed for the 'daily' shuffle mode, stable per (city, UTC day since epoch)."""
+    # CRC32 is plenty for seeding a shuffle and avoids the md5 digest -> int conversion
+    return zlib.crc32(f"{city}|{day_index}".encode("utf-8"))
+
+
+@functools.lru_cache(maxsize=64)
+def _shuffled_for_seed(types: Tuple[str, ...], seed_value: int) -> Tuple[str, ...]:
+    rng = random.Random(seed_value)
+    return tuple(rng.sample(types, len(types)))
 
 
 def shuffled_types(types: List[str], controls: Dict[str, Any]) -> List[str]:
@@ -446,15 +969,15 @@ def shuffled_types(types: List[str], controls: Dict[str, Any]) -> List[str]:
         seed_bytes = os.urandom(8)
         seed_value = int.from_bytes(seed_bytes, byteorder="big", signed=False)
     else:  # daily
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        # Whole days since the epoch; rolls over exactly at the UTC date boundary.
+        # Prefer the run's start time so a run crossing midnight keeps one order.
+        run_utc = controls.get("_run_utc")
+        now_ts = run_utc.timestamp() if run_utc is not None else time.time()
+        day_index = int(now_ts) // 86400
         city = controls.get("city_name", "") or ""
-        key = f"{city}|{today}"
-        digest = hashlib.md5(key.encode("utf-8")).digest()
-        seed_value = int.from_bytes(digest[:8], byteorder="big", signed=False)
+        seed_value = _daily_seed(city, day_index)
 
-    rng = random.Random(seed_value)
-    out = list(types)
-    rng.shuffle(out)
+    out = list(_shuffled_for_seed(tuple(types), seed_value))
     if controls.get("area_log_summary"):
         print(f"[AreaInsights][Types] Shuffled order={out}")
     return out
@@ -481,34 +1004,21 @@ def dummy_row() -> list:
     ]
 
 
-# Deprecated stubs (kept for backward compatibility)
-def places_search_nearby_v1(*args, **kwargs):
-    print("[DEPRECATED] places_search_nearby_v1 is removed.")
-    return []
-
-
-def places_search_text_v1(*args, **kwargs):
-    print("[DEPRECATED] places_search_text_v1 is removed.")
-    return []
-
-
-def generate_grid_centers(*args, **kwargs):
-    print("[DEPRECATED] generate_grid_centers is removed.")
-    return []
-
-
-def places_search_text_chunked(*args, **kwargs):
-    print("[DEPRECATED] places_search_text_chunked is removed.")
-    return []
-
-
-def filter_suspended(*args, **kwargs):
-    print("[DEPRECATED] filter_suspended is removed.")
-    return []
-
-
-def run_test_places_suspended(*args, **kwargs) -> None:
-    print("[DEPRECATED] run_test_places_suspended is removed.")
-    return
-
-
+# Deprecated names (kept for backward compatibility; resolved lazily via PEP 562)
+_DEPRECATED = frozenset({
+    "places_search_nearby_v1",
+    "places_search_text_v1",
+    "generate_grid_centers",
+    "places_search_text_chunked",
+    "filter_suspended",
+    "run_test_places_suspended",
+})
+
+
+def __getattr__(name: str):
+    if name in _DEPRECATED:
+        def _removed(*args, **kwargs):
+            print(f"[DEPRECATED] {name} is removed.")
+            return None if name == "run_test_places_suspended" else []
+        return _removed
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
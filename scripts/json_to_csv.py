@@ -1,8 +1,13 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Sequence
 
 import csv
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+
+
+# Anything other than word characters, hyphen, or space is dropped from file names
+_SAFE_FILENAME_RE = re.compile(r"[^\w\- ]")
 
 
 def _ensure_data_dir(base_dir: str | None = None) -> str:
@@ -12,40 +17,41 @@ def _ensure_data_dir(base_dir: str | None = None) -> str:
 
 
 def _iso_week_stamp(dt: datetime | None = None) -> str:
-    d = dt or datetime.utcnow()
+    d = dt or datetime.now(timezone.utc)
     year, week_num, _ = d.isocalendar()
     return f"{year}-W{week_num:02d}"
 
 
 def save_city_snapshot(
     city_name: str,
-    rows: List[List[Any]],
-    headers: List[str] | None = None,
+    rows: Iterable[Sequence[Any]],
+    headers: Sequence[str] | None = None,
     base_dir: str | None = None,
+    dt: datetime | None = None,
 ) -> str:
     """
     Save a CSV snapshot into ./data named like 'Chattanooga_snapshot_2025-W38.csv'.
 
     - city_name: Used to prefix the filename
-    - rows: 2D list matching headers order
+    - rows: rows matching headers order; any iterable, written as it is consumed
     - headers: optional; written as first row when provided
     - base_dir: optional project root (defaults to '.')
+    - dt: optional UTC timestamp for the ISO-week stamp (defaults to now)
 
     Returns the absolute path of the written CSV.
     """
     data_dir = _ensure_data_dir(base_dir)
-    stamp = _iso_week_stamp()
-    safe_city = "".join(c for c in city_name if c.isalnum() or c in ("_", "-", " ")).strip().replace(" ", "_")
+    stamp = _iso_week_stamp(dt)
+    safe_city = _SAFE_FILENAME_RE.sub("", city_name).strip().replace(" ", "_")
     filename = f"{safe_city}_snapshot_{stamp}.csv"
     path = os.path.join(data_dir, filename)
 
     # If file already exists this week, overwrite to represent the latest pre-write snapshot
-    with open(path, mode="w", newline="", encoding="utf-8") as f:
+    with open(path, mode="w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.writer(f)
         if headers:
             writer.writerow(headers)
-        for r in rows:
-            writer.writerow(r)
+        writer.writerows(rows)
     return os.path.abspath(path)
 
 
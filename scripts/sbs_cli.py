@@ -1,43 +1,62 @@
+import argparse
+import functools
+import itertools
 import sys
-import time
-import json
-from typing import Any, Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, AbstractSet, Any, Callable, Dict, Iterator, List, Sequence, Tuple
 
-import gspread
 import os
 
+if TYPE_CHECKING:
+    import gspread
+
 # Ensure project root is on sys.path so 'scripts.*' imports work when run directly
 _CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PARENT_DIR = os.path.dirname(_CURRENT_DIR)
 if _PARENT_DIR not in sys.path:
     sys.path.insert(0, _PARENT_DIR)
-from scripts.config import CONTROLS, CITY_PRESETS
+from scripts.config import CONTROLS, CITY_PRESETS, refresh_controls_ns
 from scripts.json_to_csv import save_city_snapshot
 from scripts.helpers import (
     apply_city_preset,
     load_env_or_exit,
     authorize_client,
-    fetch_place_details,
+    open_spreadsheet,
+    fetch_place_details_concurrent,
+    save_place_details_cache,
     area_insights_compute,
-    map_place_to_row,
-    select_matching_keywords,
+    parse_count_value,
+    map_details_to_rows,
     find_place_insights_under_cap,
     gather_all_under_cap_across_types,
+    shuffled_types,
+    clear_area_insights_cache,
+    set_log_tag,
+    tagged_output,
+    tagged_pool,
+    Row,
 )
-from scripts.sheets import ensure_worksheet, required_headers, assert_raw_tab_or_exit, get_existing_place_ids, run_test_append_dummy_row, get_recipients
+from scripts.sheets import required_headers, assert_raw_tab_or_exit, read_raw_tabs, ensure_raw_tab, append_rows_batch, run_test_append_dummy_row, get_recipients
 from scripts.send_email import send_weekly_summary_email
 
 
-def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
+def compute_area_insights_rows(values: Dict[str, str],
+                               controls: Dict[str, Any] | None = None,
+                               shared_details: "Dict[str, Future] | None" = None,
+                               known_ids: Callable[[], AbstractSet[str]] | None = None) -> List[Row]:
+    # Per-city controls let all-cities mode compute cities concurrently without sharing state
+    if controls is None:
+        controls = CONTROLS
     # Build location filter
-    mode = CONTROLS.get("area_insights_location_mode", "circle")
+    mode = controls.get("area_insights_location_mode", "circle")
     if mode == "circle":
         location_filter = {
             "circle": {
-                "radius": int(CONTROLS.get("area_insights_circle_radius_m", 10000)),
+                "radius": int(controls.get("area_insights_circle_radius_m", 10000)),
                 "latLng": {
-                    "latitude": CONTROLS["places_center_lat"],
-                    "longitude": CONTROLS["places_center_lng"],
+                    "latitude": controls["places_center_lat"],
+                    "longitude": controls["places_center_lng"],
                 },
             }
         }
@@ -46,28 +65,24 @@ def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
         return []
 
     # Type filter (required by API). Fallbacks: places_type → places_keyword → ["restaurant"]
-    types = CONTROLS.get("area_insights_types")
+    types = controls.get("area_insights_types")
     if not types or not isinstance(types, list) or len(types) == 0:
-        fallback_type = CONTROLS.get("places_type")
+        fallback_type = controls.get("places_type")
         if not fallback_type:
-            kw = CONTROLS.get("places_keyword")
+            kw = controls.get("places_keyword")
             if kw and isinstance(kw, str) and kw.strip():
                 fallback_type = kw.strip()
         if not fallback_type:
             fallback_type = "restaurant"
         types = [fallback_type]
-        if CONTROLS.get("area_log_summary"):
+        if controls.get("area_log_summary"):
             print(f"[AreaInsights] Using type fallback includedTypes={types}")
     # Optional shuffle of types
-    try:
-        from scripts.helpers import shuffled_types as _shuffled_types
-        ordered_types = _shuffled_types(types, CONTROLS)
-    except Exception:
-        ordered_types = list(types)
+    ordered_types = shuffled_types(types, controls)
     type_filter = {"includedTypes": ordered_types}
 
     # If mode == count, iterate statuses and log counts
-    aimode = CONTROLS.get("area_insights_mode", "count")
+    aimode = controls.get("area_insights_mode", "count")
     if aimode == "count":
         statuses = [
             "OPERATING_STATUS_PERMANENTLY_CLOSED",
@@ -75,35 +90,46 @@ def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
             "OPERATING_STATUS_OPERATIONAL",
         ]
         results: Dict[str, int] = {}
+        # Statuses are independent requests; issue them together (credentials are shared/cached)
+        with tagged_pool(len(statuses)) as ex:
+            futures = {
+                st: ex.submit(
+                    area_insights_compute,
+                    values,
+                    insights=["INSIGHT_COUNT"],
+                    location_filter=location_filter,
+                    type_filter=type_filter,
+                    operating_status=[st],
+                )
+                for st in statuses
+            }
         for st in statuses:
-            data = area_insights_compute(
-                values,
-                insights=["INSIGHT_COUNT"],
-                location_filter=location_filter,
-                type_filter=type_filter,
-                operating_status=[st],
-            )
-            count_str = data.get("count") or "0"
+            # One failed status is reported as 0 without discarding the others
             try:
-                results[st] = int(count_str)
-            except Exception:
-                results[st] = 0
-            if CONTROLS.get("area_log_summary"):
+                data = futures[st].result()
+            except Exception as e:
+                print(f"[AreaInsights][Count][Error] {st}: {e}")
+                data = {}
+            if "_error" in data:
+                err = data["_error"]
+                print(f"[AreaInsights][Count][Error] {st}: status={err['status']} body={err['body']}")
+            results[st] = parse_count_value(data)
+            if controls.get("area_log_summary"):
                 print(f"[AreaInsights][Count] {st}={results[st]}")
-        if CONTROLS.get("area_log_summary"):
+        if controls.get("area_log_summary"):
             print("[AreaInsights][Count] summary={" + ", ".join([f"{k}:{results[k]}" for k in statuses]) + "}")
         return []
 
     # mode == places: fetch IDs, then fetch details and optionally write
-    operating_status = CONTROLS.get("area_insights_operating_status") or [
+    operating_status = controls.get("area_insights_operating_status") or [
         "OPERATING_STATUS_PERMANENTLY_CLOSED",
         "OPERATING_STATUS_TEMPORARILY_CLOSED",
     ]
     # Reflight with counts to respect cap and get place insights using helpers
-    max_per = int(CONTROLS.get("area_max_places_per_request", 100))
+    max_per = int(controls.get("area_max_places_per_request", 100))
     working_types: List[str] = list(type_filter.get("includedTypes", []))
     # Choose strategy: gather-all vs single-batch-under-cap
-    if bool(CONTROLS.get("area_enable_gather_all_types", False)):
+    if bool(controls.get("area_enable_gather_all_types", False)):
         place_insights = gather_all_under_cap_across_types(
             values=values,
             location_filter=location_filter,
@@ -120,36 +146,22 @@ def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
             max_per=max_per,
         )
 
-    # Fetch details up to overall max
-    details: List[Dict[str, Any]] = []
-    overall_max = int(CONTROLS.get("area_insights_overall_max", 500))
-    pause = float(CONTROLS.get("area_details_pause_secs", 0.1))
-    for idx, pi in enumerate(place_insights):
-        if len(details) >= overall_max:
-            break
-        place_resource = pi.get("place")
-        if not place_resource:
-            continue
-        d = fetch_place_details(values, place_resource)
-        if d:
-            details.append(d)
-        if pause > 0:
-            time.sleep(pause)
-
-    if CONTROLS.get("area_log_summary"):
-        print(f"[AreaInsights][Details] fetched={len(details)}")
+    # Places already on the sheet would be deduped away after fetching; skip their details.
+    # known_ids is resolved only now so the background Sheets read has had the whole places phase.
+    skip_ids = known_ids() if known_ids is not None else frozenset()
 
-    # Write closed places to sheet
-    if not details:
-        print("[AreaInsights] No details fetched; nothing to prepare.")
-        return []
+    # Stream details up to overall max: sample the head, then map rows as details arrive
+    overall_max = int(controls.get("area_insights_overall_max", 500))
+    details_stream = _stream_details(place_insights, values, overall_max, shared_details, skip_ids)
 
     # Optionally print a few sample details
-    sample_n = int(CONTROLS.get("area_log_details_sample_count", 0) or 0)
-    if sample_n > 0:
+    sample_n = int(controls.get("area_log_details_sample_count", 0) or 0)
+    head = list(itertools.islice(details_stream, sample_n)) if sample_n > 0 else []
+    if head:
         print("[AreaInsights][Details][Sample]")
-        for p in details[:sample_n]:
-            dn = (p.get("displayName") or {}).get("text") if isinstance(p.get("displayName"), dict) else p.get("displayName")
+        for p in head:
+            dn_raw = p.get("displayName")
+            dn = dn_raw.get("text") if isinstance(dn_raw, dict) else dn_raw
             bs = p.get("businessStatus")
             rt = p.get("rating")
             ur = p.get("userRatingCount")
@@ -157,7 +169,8 @@ def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
             loc = p.get("location") or {}
             lat = loc.get("latitude")
             lng = loc.get("longitude")
-            tps = ",".join(p.get("types") or [])
+            types_list = p.get("types") or []
+            tps = ",".join(types_list)
             print({
                 "name": dn,
                 "status": bs,
@@ -169,97 +182,213 @@ def compute_area_insights_rows(values: Dict[str, str]) -> List[List[Any]]:
                 "types": tps,
             })
 
-    # Map and append to Sheets when configured
+    # Map closed places to rows
     # Use intersection between each place's types and the allowed types for more specific keywords
-    allowed_types = list(types)
-    rows: List[List[Any]] = []
-    write_only_closed = bool(CONTROLS.get("area_write_only_closed", True))
-    for p in details:
-        if write_only_closed:
-            bs = p.get("businessStatus")
-            # Only temporarily closed per new requirement
-            if bs != "CLOSED_TEMPORARILY":
-                continue
-        specific_kw = select_matching_keywords(p.get("types") or [], allowed_types)
-        rows.append(map_place_to_row(p, specific_kw, None, None))
+    write_only_closed = bool(controls.get("area_write_only_closed", True))
+    # Closed-only runs may stop fetching once enough closed rows are in hand
+    max_rows = int(controls.get("area_overall_max_closed", 0) or 0) if write_only_closed else 0
+    rows, fetched_n = map_details_to_rows(
+        itertools.chain(head, details_stream), frozenset(types), write_only_closed, max_rows=max_rows or None,
+    )
+    # Stop any remaining fetches and persist the details cache now, not at garbage collection
+    details_stream.close()
+
+    if controls.get("area_log_summary"):
+        print(f"[AreaInsights][Details] fetched={fetched_n}")
+
+    if not fetched_n:
+        print("[AreaInsights] No details fetched; nothing to prepare.")
+        return []
     if not rows:
         print("[AreaInsights] No rows prepared.")
         return []
     return rows
 
 
-def write_rows_to_sheet(values: Dict[str, str], spreadsheet_id: str, city_name: str, tab_title: str, rows: List[List[Any]]) -> int:
-    if not rows:
-        return 0
-    if not bool(CONTROLS.get("area_insights_write_enabled", True)):
-        print(f"[AreaInsights] Write disabled by control. Prepared {len(rows)} rows.")
-        return 0
-    if not spreadsheet_id:
-        print("[AreaInsights] Missing SPREADSHEET_ID; skipping write.")
-        return 0
-    assert_raw_tab_or_exit(tab_title)
-
-    client = authorize_client(values)
-    sh = client.open_by_key(spreadsheet_id)
-    ws = ensure_worksheet(sh, tab_title, required_headers())
-
-    existing_ids = get_existing_place_ids(ws)
-    unique_rows: List[List[Any]] = []
-    seen_batch: set[str] = set()
-    for r in rows:
-        pid = r[0]
-        if not pid:
-            continue
-        if pid in existing_ids or pid in seen_batch:
-            continue
-        seen_batch.add(pid)
-        unique_rows.append(r)
+def _stream_details(place_insights: List[Dict[str, Any]],
+                    values: Dict[str, str],
+                    overall_max: int,
+                    shared_details: "Dict[str, Future] | None" = None,
+                    skip_ids: AbstractSet[str] = frozenset()) -> Iterator[Dict[str, Any]]:
+    """Yield up to overall_max non-empty Place Details in place_insights order.
+
+    Failed or empty lookups don't count toward overall_max; the next place is tried
+    instead. Closing the generator stops further fetches.
+
+    shared_details (resource -> Future) lets several cities reuse one fetch per place.
+    Resources whose place id ('places/<id>') is in skip_ids are not fetched.
+    """
+    concurrency = int(CONTROLS.get("area_details_concurrency", 8) or 1)
+    resources = [pr for pi in place_insights if (pr := pi.get("place"))]
+    if skip_ids:
+        before_n = len(resources)
+        resources = [pr for pr in resources if pr.rpartition("/")[2] not in skip_ids]
+        if CONTROLS.get("area_log_summary"):
+            print(f"[AreaInsights][Details] skipping {before_n - len(resources)} places already on the sheet")
+    details = fetch_place_details_concurrent(values, resources, max_workers=concurrency, shared=shared_details)
+    try:
+        # The fetcher is lazy: once overall_max details are yielded, closing it leaves at
+        # most one submission window of extra requests
+        yield from itertools.islice(filter(None, details), max(0, overall_max))
+    finally:
+        details.close()
+        save_place_details_cache()
+
+
+def _prefetch_existing_ids(values: Dict[str, str], spreadsheet_id: str, tab_titles: List[str]) -> Tuple["gspread.Spreadsheet", Dict[str, Tuple["gspread.Worksheet | None", bool, frozenset[str]]]]:
+    """Open the spreadsheet and read every Raw tab's header state and place_ids in one batchGet (read-only)."""
+    sh = open_spreadsheet(values, spreadsheet_id)
+    return sh, read_raw_tabs(sh, tab_titles)
+
+
+def prepare_unique_rows(city_name: str, rows: Sequence[Sequence[Any]], existing_ids: AbstractSet[str]) -> List[List[Any]]:
+    """Drop rows already on the tab (or repeated in the batch) and snapshot the rest to CSV."""
+    # Dedupe the batch by place_id (key order = first occurrence)
+    batch_by_id = {r[0]: r for r in rows if r[0]}
+    if not batch_by_id:
+        print("[AreaInsights] No rows with a place_id to append.")
+        return []
+    # existing_ids is a set (O(1) membership); skip per-row tests when nothing overlaps.
+    # Plain lists for gspread/csv (some JSON encoders serialize namedtuples as objects)
+    if existing_ids.isdisjoint(batch_by_id):
+        unique_rows: List[List[Any]] = [list(r) for r in batch_by_id.values()]
+    else:
+        unique_rows = [list(r) for pid, r in batch_by_id.items() if pid not in existing_ids]
 
     if not unique_rows:
         print("[AreaInsights] No new unique rows to append (deduped).")
-        return 0
+        return []
 
     if bool(CONTROLS.get("snapshot_enable", True)):
         try:
             headers = required_headers() if bool(CONTROLS.get("snapshot_include_headers", True)) else None
             base_dir = CONTROLS.get("snapshot_base_dir") or "."
-            snap_path = save_city_snapshot(city_name, unique_rows, headers=headers, base_dir=base_dir)
+            snap_path = save_city_snapshot(city_name, unique_rows, headers=headers, base_dir=base_dir, dt=CONTROLS.get("_run_utc"))
             if CONTROLS.get("area_log_summary"):
                 print(f"[Snapshot] Wrote CSV snapshot before append: {snap_path}")
         except Exception as e:
             print(f"[Snapshot][Warning] Failed to write snapshot: {e}")
-
-    ws.append_rows(unique_rows, value_input_option="RAW")
-    appended_n = len(unique_rows)
-    print(f"[AreaInsights] Appended {appended_n} new rows to '{tab_title}'.")
-    return appended_n
+    return unique_rows
+
+
+def write_rows_by_city(values: Dict[str, str],
+                       spreadsheet_id: str,
+                       rows_by_city: Dict[str, List[Row]],
+                       tab_by_city: Dict[str, str],
+                       prefetch_future: "Future | None" = None) -> Dict[str, int]:
+    """Append each city's new rows to its Raw tab with one batchUpdate; returns appended counts.
+
+    A city whose tab can't be appended to is logged and left out of the counts;
+    the other cities are still written.
+    """
+    appended: Dict[str, int] = {}
+    cities = [c for c, rows in rows_by_city.items() if rows]
+    if not cities:
+        return appended
+    if not bool(CONTROLS.get("area_insights_write_enabled", True)):
+        for city in cities:
+            print(f"[AreaInsights] Write disabled by control. Prepared {len(rows_by_city[city])} rows.")
+        return appended
+    if not spreadsheet_id:
+        print("[AreaInsights] Missing SPREADSHEET_ID; skipping write.")
+        return appended
+    prefetched = None
+    if prefetch_future is None:
+        # With a prefetch, run_all_cities has already validated the tabs before opening them
+        for city in cities:
+            assert_raw_tab_or_exit(tab_by_city[city])
+    else:
+        try:
+            prefetched = prefetch_future.result()
+        except Exception as e:
+            print(f"[AreaInsights][Warning] Prefetching existing place_ids failed; reading again: {e}")
+    if prefetched is None:
+        prefetched = _prefetch_existing_ids(values, spreadsheet_id, [tab_by_city[c] for c in cities])
+    sh, tabs = prefetched
+
+    headers = required_headers()
+    pending: List[Tuple[str, "gspread.Worksheet", List[List[Any]]]] = []
+    for city in cities:
+        tab_title = tab_by_city[city]
+        ws, header_blank, existing_ids = tabs[tab_title]
+        unique_rows = prepare_unique_rows(city, rows_by_city[city], existing_ids)
+        if unique_rows:
+            # Tabs are created / given headers only here, once there is something to write
+            pending.append((city, ensure_raw_tab(sh, tab_title, ws, header_blank, headers), unique_rows))
+    if not pending:
+        return appended
+
+    failed = {ws.id: e for ws, e in append_rows_batch(sh, [(ws, unique_rows) for _, ws, unique_rows in pending])}
+    for city, ws, unique_rows in pending:
+        if ws.id in failed:
+            print(f"[AreaInsights][Error] Failed to append {len(unique_rows)} rows to '{tab_by_city[city]}': {failed[ws.id]}", file=sys.stderr)
+            continue
+        appended[city] = len(unique_rows)
+        print(f"[AreaInsights] Appended {len(unique_rows)} new rows to '{tab_by_city[city]}'.")
+    return appended
 
 
 def run_all_cities(values: Dict[str, str], spreadsheet_id: str) -> None:
-    # Optional: run for all configured cities, compute first, then write once per city
+    # Optional: run for all configured cities, compute first, then write all cities in one batch
     city_names = CONTROLS.get("cities_list") or list(CITY_PRESETS.keys())
     counts_by_city: Dict[str, int] = {c: 0 for c in city_names}
-    prepared_rows_by_city: Dict[str, List[List[Any]]] = {}
-    for city in city_names:
-        CONTROLS["city_name"] = city
-        apply_city_preset(CONTROLS)
-        if CONTROLS.get("area_log_summary"):
-            print(f"[Runner] All-cities mode: computing Area Insights for {city}")
-        rows: List[List[Any]] = []
-        if CONTROLS.get("area_insights_enable"):
-            rows = compute_area_insights_rows(values)
-        prepared_rows_by_city[city] = rows
-    # Now write sequentially per city
-    for city in city_names:
-        tab_title = CITY_PRESETS.get(city, {}).get("tab", f"{city}_Raw")
-        rows = prepared_rows_by_city.get(city) or []
-        appended = write_rows_to_sheet(values, spreadsheet_id, city, tab_title, rows)
+    prepared_rows_by_city: Dict[str, List[Row]] = {}
+    tab_by_city = {city: CITY_PRESETS.get(city, {}).get("tab", f"{city}_Raw") for city in city_names}
+
+    # Read existing place_ids for every tab in the background while Area Insights runs
+    prefetch_future: "Future | None" = None
+    if CONTROLS.get("area_insights_enable") and bool(CONTROLS.get("area_insights_write_enabled", True)) and spreadsheet_id:
+        for tab_title in tab_by_city.values():
+            assert_raw_tab_or_exit(tab_title)
+        prefetch_ex = ThreadPoolExecutor(max_workers=1)
+        prefetch_future = prefetch_ex.submit(_prefetch_existing_ids, values, spreadsheet_id, list(tab_by_city.values()))
+        prefetch_ex.shutdown(wait=False)
+
+    # Count memo keys include the location, so one clear per run keeps cities independent
+    clear_area_insights_cache()
+    # Overlapping cities share one Place Details fetch per resource
+    shared_details: Dict[str, Future] = {}
+
+    def _known_ids(tab_title: str) -> AbstractSet[str]:
+        # Existing place_ids for a tab from the background prefetch (empty if unavailable)
+        if prefetch_future is None:
+            return frozenset()
+        try:
+            return prefetch_future.result()[1][tab_title][2]
+        except Exception:
+            return frozenset()
+
+    def _compute_city(city: str) -> List[Row]:
+        # Every line this city logs (including from its worker pools) is prefixed with [city]
+        set_log_tag(city)
+        try:
+            city_controls = dict(CONTROLS)
+            city_controls["city_name"] = city
+            apply_city_preset(city_controls)
+            if city_controls.get("area_log_summary"):
+                print(f"[Runner] All-cities mode: computing Area Insights for {city}")
+            if not city_controls.get("area_insights_enable"):
+                return []
+            return compute_area_insights_rows(values, city_controls, shared_details, functools.partial(_known_ids, tab_by_city[city]))
+        finally:
+            set_log_tag(None)
+
+    # Cities are independent and network-bound; overlap them (writes stay sequential below)
+    workers = max(1, min(int(CONTROLS.get("cities_compute_concurrency", 1) or 1), len(city_names)))
+    with tagged_output():
+        if workers <= 1:
+            city_rows = list(map(_compute_city, city_names))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                city_rows = list(ex.map(_compute_city, city_names))
+    prepared_rows_by_city.update(zip(city_names, city_rows))
+    # Now write every city's new rows in one batch (after all cities are computed)
+    for city, appended in write_rows_by_city(values, spreadsheet_id, prepared_rows_by_city, tab_by_city, prefetch_future).items():
         counts_by_city[city] = counts_by_city.get(city, 0) + int(appended or 0)
     # Send one email after all cities (if enabled)
     if bool(CONTROLS.get("notify_email_after_write_enable")):
         try:
-            client = authorize_client(values)
-            sh = client.open_by_key(spreadsheet_id)
+            sh = open_spreadsheet(values, spreadsheet_id)
             rows_recips = get_recipients(sh, "Recipients")
             to_emails = CONTROLS.get("notify_email_after_write_to_emails") or [r.get("email_address") for r in rows_recips if r.get("email_address")]
         except Exception as e:
@@ -291,7 +420,17 @@ def run_all_cities(values: Dict[str, str], spreadsheet_id: str) -> None:
                     print(f"[Notify] Failed to send email: {e}", file=sys.stderr)
 
 
-def main() -> None:
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Suspended Business Scanner")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk Place Details cache")
+    args = parser.parse_args(argv)
+    if args.no_cache:
+        CONTROLS["places_details_cache_enable"] = False
+    # One clock read per run: the daily shuffle seed and the snapshot week stamp both use it
+    CONTROLS["_run_utc"] = datetime.now(timezone.utc)
+    # Helpers read the attribute snapshot; rebuild it so overrides above are seen
+    refresh_controls_ns()
+
     values = load_env_or_exit()
     spreadsheet_id = values.get("SPREADSHEET_ID")
     if not spreadsheet_id:
@@ -312,8 +451,7 @@ def main() -> None:
     # Optional: isolated email test
     if bool(CONTROLS.get("notify_email_test_enable")):
         try:
-            client = authorize_client(values)
-            sh = client.open_by_key(spreadsheet_id)
+            sh = open_spreadsheet(values, spreadsheet_id)
         except Exception as e:
             print(f"[EmailTest] Failed to open spreadsheet: {e}", file=sys.stderr)
             sys.exit(1)
@@ -322,7 +460,6 @@ def main() -> None:
         to_emails = CONTROLS.get("notify_email_test_to_emails") or []
         if not to_emails:
             try:
-                from scripts.sheets import get_recipients
                 rows = get_recipients(sh, "Recipients")
                 to_emails = [r.get("email_address") for r in rows if r.get("email_address")]
             except Exception as e:
@@ -1,18 +1,60 @@
 import os
+import functools
 import json
 import sys
-from typing import List, Dict, Tuple
-
-import requests
-
-
-def load_templates(path: str) -> dict:
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping, Tuple
+
+from scripts.helpers import json_dumps, json_loads
+
+
+# SendGrid v3 mail/send accepts at most 1000 recipients per request
+_SENDGRID_MAX_RECIPIENTS = 1000
+
+# Pooled session for SendGrid (keep-alive across chunked sends); created on first send
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        # mail/send is not idempotent: retry only failures where SendGrid did not accept the
+        # message (connection errors, 429 rate limits), never read timeouts or 5xx
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            backoff_factor=0.2,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=retry))
+        _SESSION = session
+    return _SESSION
+
+
+@functools.lru_cache(maxsize=4)
+def _load_templates_cached(path: str, mtime_ns: int) -> Mapping[str, Any]:
+    # mtime_ns is only part of the cache key, so an edited file is re-read
+    with open(path, "r", encoding="utf-8") as f:
+        return MappingProxyType(json.load(f))
+
+
+def load_templates(path: str) -> Mapping[str, Any]:
+    """Load templates.json, cached per (path, mtime); the result is read-only."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        path = os.path.abspath(path)
+        return _load_templates_cached(path, os.stat(path).st_mtime_ns)
     except Exception as e:
         print(f"[Email][Templates] Failed to load {path}: {e}", file=sys.stderr)
-        return {}
+        return MappingProxyType({})
 
 
 def render_text(template: str, **kwargs) -> str:
@@ -46,33 +88,45 @@ def send_email_sendgrid(api_key: str,
     if from_name:
         sender["name"] = from_name
 
-    # One personalization with all recipients in the To list.
-    # Adjust to BCC if you prefer hiding recipients from each other.
-    body = {
-        "personalizations": [
-            {
-                "to": [{"email": e} for e in to_emails],
-                "subject": subject,
-            }
-        ],
-        "from": sender,
-        "content": [
-            {"type": "text/plain", "value": body_text}
-        ],
-    }
-
-    resp = requests.post(url, headers=headers, json=body, timeout=30)
-    if resp.status_code not in (200, 202):
-        try:
-            err = resp.json()
-        except Exception:
-            err = {"non_json": resp.text}
-        raise RuntimeError(f"[Email] SendGrid error {resp.status_code}: {err}")
+    # Recipients go in BCC so they don't see each other; the sender is the visible To.
+    # SendGrid rejects an address repeated within a personalization, so the sender is
+    # dropped from BCC. The recipient cap counts To + BCC across the whole request,
+    # so larger lists go out as several requests.
+    bcc = [e for e in to_emails if e.lower() != from_email.lower()]
+    per_request = _SENDGRID_MAX_RECIPIENTS - 1
+    content = [{"type": "text/plain", "value": body_text}]
+    bodies = []
+    for i in range(0, max(len(bcc), 1), per_request):
+        personalization = {"to": [{"email": from_email}], "subject": subject}
+        chunk = bcc[i:i + per_request]
+        if chunk:
+            personalization["bcc"] = [{"email": e} for e in chunk]
+        bodies.append({"personalizations": [personalization], "from": sender, "content": content})
+
+    session = _get_session()
+
+    def _post(body: dict) -> None:
+        resp = session.post(url, headers=headers, data=json_dumps(body), timeout=30)
+        if resp.status_code not in (200, 202):
+            try:
+                err = json_loads(resp.content)
+            except Exception:
+                err = {"non_json": resp.text}
+            raise RuntimeError(f"[Email] SendGrid error {resp.status_code}: {err}")
+
+    if len(bodies) == 1:
+        _post(bodies[0])
+        return
+    # Independent requests: send together; the first failure is raised after all complete
+    with ThreadPoolExecutor(max_workers=min(8, len(bodies))) as ex:
+        futures = [ex.submit(_post, body) for body in bodies]
+    for fut in futures:
+        fut.result()
 
 
 def build_summary_email_message(counts: Dict[str, int],
                                 sheet_link: str,
-                                templates: dict | None = None,
+                                templates: Mapping[str, Any] | None = None,
                                 templates_path: str | None = None) -> Tuple[str, str, str | None]:
     """Return (subject, body_text, from_name) for the weekly summary email.
 
@@ -109,7 +163,7 @@ def send_weekly_summary_email(api_key: str,
                               to_emails: List[str],
                               counts: Dict[str, int],
                               sheet_link: str,
-                              templates: dict | None = None,
+                              templates: Mapping[str, Any] | None = None,
                               templates_path: str | None = None) -> None:
     """Convenience wrapper: build the summary message and send via SendGrid."""
     subject, body_text, from_name = build_summary_email_message(
@@ -1,58 +1,186 @@
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
 
 import sys
-import gspread
+from operator import itemgetter
 
+# gspread is imported lazily where its exceptions are needed, so importing this
+# module (e.g. for required_headers) doesn't load the Google client stack.
+if TYPE_CHECKING:
+    import gspread
 
-def ensure_worksheet(spreadsheet: gspread.Spreadsheet, title: str, headers: List[str]) -> gspread.Worksheet:
+
+def ensure_worksheet(spreadsheet: "gspread.Spreadsheet", title: str, headers: Sequence[str]) -> "gspread.Worksheet":
+    from gspread import WorksheetNotFound
     try:
         ws = spreadsheet.worksheet(title)
-    except gspread.WorksheetNotFound:
+    except WorksheetNotFound:
         ws = spreadsheet.add_worksheet(title=title, rows=100, cols=max(10, len(headers)))
         if headers:
-            ws.update('1:1', [headers])
+            ws.update('1:1', [list(headers)])
     # If worksheet exists but empty, add headers if first row is blank
     if headers:
         first_row = ws.row_values(1)
         if not first_row:
-            ws.update('1:1', [headers])
+            ws.update('1:1', [list(headers)])
     return ws
 
 
-def required_headers() -> List[str]:
-    return [
-        "place_id",
-        "name",
-        "business_status",
-        "business_address",
-        "lat",
-        "lng",
-        "types",
-        "rating",
-        "user_ratings_total",
-        "keyword",
-        "grid_lat",
-        "grid_lng",
-    ]
+# Raw tab columns, in the order rows are written
+_REQUIRED_HEADERS: Tuple[str, ...] = (
+    "place_id",
+    "name",
+    "business_status",
+    "business_address",
+    "lat",
+    "lng",
+    "types",
+    "rating",
+    "user_ratings_total",
+    "keyword",
+    "grid_lat",
+    "grid_lng",
+)
+
+
+def required_headers() -> Tuple[str, ...]:
+    return _REQUIRED_HEADERS
+
+
+# Only *_Raw tabs are written; *_View tabs hold formulas over them
+_RAW_TAB_SUFFIX = "_Raw"
+
+
+def is_raw_tab(tab_name: str) -> bool:
+    return tab_name.endswith(_RAW_TAB_SUFFIX)
 
 
 def assert_raw_tab_or_exit(tab_name: str) -> None:
-    if not tab_name.endswith("_Raw"):
+    if not is_raw_tab(tab_name):
         print("Refusing to write: target tab must end with '_Raw' to avoid *_View tabs.", file=sys.stderr)
         sys.exit(1)
 
 
-def get_existing_place_ids(ws: gspread.Worksheet) -> set[str]:
+def _place_ids_from_column(col: List[str]) -> frozenset[str]:
+    if col and isinstance(col[0], str) and col[0].strip().lower() == "place_id":
+        col = col[1:]
+    # Sheets returns formatted values as strings; strip and drop blanks in C
+    return frozenset(filter(None, map(str.strip, col)))
+
+
+def get_existing_place_ids(ws: "gspread.Worksheet") -> frozenset[str]:
     try:
         col = ws.col_values(1) or []
     except Exception:
-        return set()
-    if col and isinstance(col[0], str) and col[0].strip().lower() == "place_id":
-        col = col[1:]
-    return set(v for v in col if v)
+        return frozenset()
+    return _place_ids_from_column(col)
+
+
+def _a1_sheet(title: str) -> str:
+    # A1 notation quotes sheet names; embedded quotes are doubled
+    return "'{}'".format(title.replace("'", "''"))
+
+
+def read_raw_tabs(spreadsheet: "gspread.Spreadsheet",
+                  tab_titles: List[str]) -> Dict[str, Tuple["gspread.Worksheet | None", bool, frozenset[str]]]:
+    """Read each tab's header state and existing place_ids without modifying the spreadsheet.
+
+    Returns title -> (worksheet, or None when the tab doesn't exist yet; whether the
+    header row is empty; existing place_ids). Uses one metadata fetch for all
+    worksheets and one values.batchGet for every existing tab's header row and
+    place_id column together. Call ensure_raw_tab before writing to a tab.
+    """
+    if not tab_titles:
+        return {}
+    by_title = {ws.title: ws for ws in spreadsheet.worksheets()}
+    present = [title for title in tab_titles if title in by_title]
+    ranges: List[str] = []
+    for title in present:
+        sheet = _a1_sheet(title)
+        ranges += [f"{sheet}!1:1", f"{sheet}!A:A"]
+    value_ranges = (spreadsheet.values_batch_get(ranges).get("valueRanges") or []) if ranges else []
 
+    def _values(i: int) -> List[List[Any]]:
+        return (value_ranges[i].get("values") if i < len(value_ranges) else None) or []
 
-def run_test_append_dummy_row(client: gspread.Client, spreadsheet_id: str, tab_name: str, dummy_row_func) -> None:
+    tabs: Dict[str, Tuple["gspread.Worksheet | None", bool, frozenset[str]]] = {
+        title: (None, True, frozenset()) for title in tab_titles
+    }
+    for n, title in enumerate(present):
+        first_row, col_rows = _values(2 * n), _values(2 * n + 1)
+        # Same emptiness test as ensure_worksheet: the API omits "values" for an empty row
+        ids = _place_ids_from_column([r[0] if r else "" for r in col_rows])
+        tabs[title] = (by_title[title], not first_row, ids)
+    return tabs
+
+
+def ensure_raw_tab(spreadsheet: "gspread.Spreadsheet",
+                   title: str,
+                   ws: "gspread.Worksheet | None",
+                   header_blank: bool,
+                   headers: Sequence[str]) -> "gspread.Worksheet":
+    """Create the tab or fill its empty header row, as ensure_worksheet does, from read_raw_tabs state."""
+    if ws is None:
+        ws = spreadsheet.add_worksheet(title=title, rows=100, cols=max(10, len(headers)))
+        if headers:
+            ws.update('1:1', [list(headers)])
+    elif headers and header_blank:
+        # Worksheet exists but its first row is blank
+        ws.update('1:1', [list(headers)])
+    return ws
+
+
+def _cell_data(value: Any) -> Dict[str, Any]:
+    """Typed userEnteredValue for appendCells (mirrors RAW input: strings stay strings)."""
+    if value is None:
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def append_rows_batch(spreadsheet: "gspread.Spreadsheet",
+                      rows_by_ws: List[Tuple["gspread.Worksheet", List[List[Any]]]]) -> List[Tuple["gspread.Worksheet", Exception]]:
+    """Append rows to several worksheets with a single spreadsheets.batchUpdate.
+
+    Each worksheet gets one AppendCellsRequest, which writes after its last row
+    with data and inserts rows as needed (same effect as append_rows with
+    INSERT_ROWS, without one round trip per tab). batchUpdate is all-or-nothing,
+    so if it fails (e.g. one tab was deleted, is protected or is over the cell
+    limit) each tab is retried on its own and one bad tab doesn't block the rest.
+    Returns (worksheet, error) for the tabs that could not be appended to.
+    """
+    from gspread.exceptions import APIError
+    requests = [
+        (ws, {
+            "appendCells": {
+                "sheetId": ws.id,
+                "rows": [{"values": [_cell_data(v) for v in row]} for row in rows],
+                "fields": "userEnteredValue",
+            }
+        })
+        for ws, rows in rows_by_ws
+        if rows
+    ]
+    if not requests:
+        return []
+    try:
+        spreadsheet.batch_update({"requests": [req for _, req in requests]})
+        return []
+    except APIError as e:
+        if len(requests) == 1:
+            return [(requests[0][0], e)]
+    failed: List[Tuple["gspread.Worksheet", Exception]] = []
+    for ws, req in requests:
+        try:
+            spreadsheet.batch_update({"requests": [req]})
+        except APIError as e:
+            failed.append((ws, e))
+    return failed
+
+
+def run_test_append_dummy_row(client: "gspread.Client", spreadsheet_id: str, tab_name: str, dummy_row_func) -> None:
     sh = client.open_by_key(spreadsheet_id)
     ws = ensure_worksheet(sh, tab_name, required_headers())
     ws.append_row(dummy_row_func(), value_input_option="RAW")
@@ -60,15 +188,16 @@ def run_test_append_dummy_row(client: gspread.Client, spreadsheet_id: str, tab_n
 
 
 # Recipients utilities
-def get_recipients(spreadsheet: gspread.Spreadsheet, tab_name: str = "Recipients") -> List[Dict[str, str]]:
+def get_recipients(spreadsheet: "gspread.Spreadsheet", tab_name: str = "Recipients") -> List[Dict[str, str]]:
     """Read recipients from a worksheet.
 
     Expects header row with: name, email_address, whatsapp_number
     Returns a list of dicts with those keys. Skips blank or incomplete rows.
     """
+    from gspread import WorksheetNotFound
     try:
         ws = spreadsheet.worksheet(tab_name)
-    except gspread.WorksheetNotFound:
+    except WorksheetNotFound:
         print(f"[Recipients] Worksheet '{tab_name}' not found.", file=sys.stderr)
         return []
     try:
@@ -84,16 +213,13 @@ def get_recipients(spreadsheet: gspread.Spreadsheet, tab_name: str = "Recipients
         if r not in idx:
             print(f"[Recipients] Missing header '{r}' in '{tab_name}'.", file=sys.stderr)
             return []
+    getter = itemgetter(*(idx[r] for r in required))
     rows: List[Dict[str, str]] = []
     for raw in values[1:]:
         try:
-            name = (raw[idx["name"]] or "").strip()
-            email = (raw[idx["email_address"]] or "").strip()
-            whatsapp = (raw[idx["whatsapp_number"]] or "").strip()
+            name, email, whatsapp = ((v or "").strip() for v in getter(raw))
         except Exception:
             continue
-        if not name and not email and not whatsapp:
-            continue
         if not email and not whatsapp:
             # Require at least one contact method
             continue